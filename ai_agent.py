@@ -1,11 +1,81 @@
 from typing import List, Optional, Tuple
-from queue import PriorityQueue, Queue
-from collections import deque
+from array import array
+from collections import deque, namedtuple
+from multiprocessing.connection import Connection
+import heapq
+import multiprocessing
+import os
+import signal
+import sys
 import time
-from game_engine import GameState, Direction
+from game_engine import GameState, Direction, Tile, DIRS, DX, DY
+
+# How many expansions run between wall-clock checks in the search loops
+TIME_CHECK_INTERVAL = 64
+
+# Nodes handed to each pool worker per round of the parallel A*
+PARALLEL_BATCH_PER_WORKER = 8
+
+# Expansions the sequential A* runs before handing its open list to the process pool -
+# pool startup costs more than most bundled levels take to solve outright
+PARALLEL_SWITCH_NODES = 20000
+
+# Search tree node - move is a direction index, the path is rebuilt from parent links only once, at the end
+SearchNode = namedtuple('SearchNode', 'state parent move g')
+
+class _Node:
+    """A* node record - kept in a list so the heap only holds (f, index) pairs"""
+    __slots__ = ('state', 'parent', 'move', 'g', 'h')
+
+    def __init__(self, state, parent, move, g, h):
+        self.state = state
+        self.parent = parent
+        self.move = move
+        self.g = g
+        self.h = h
+
+def _reconstruct(node) -> List[Direction]:
+    """Walk parent links back to the root and return the moves in order as Directions"""
+    path = []
+    while node is not None and node.parent is not None:
+        path.append(DIRS[node.move])
+        node = node.parent
+    path.reverse()
+    return path
+
+def _reconstruct_ids(parents: array, actions: bytearray, node_id: int) -> List[Direction]:
+    """Same as _reconstruct for a search tree stored as flat parent / direction-index arrays"""
+    path = []
+    while parents[node_id] >= 0:
+        path.append(DIRS[actions[node_id]])
+        node_id = parents[node_id]
+    path.reverse()
+    return path
 
 class AStarSearch:
     """A* search with improved heuristics and generous limits"""
+    def __init__(self, workers: Optional[int] = None):
+        # With more than one core, a hard search that is still running after
+        # PARALLEL_SWITCH_NODES expansions moves onto a process pool
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        # Targets never move, so they are snapshotted once per search
+        self._targets = frozenset()
+        self._target_list = []
+        # Walking distance from every target to every cell, see _precompute_target_distances
+        self._dist = {}
+        self._nearest_flat = []
+        # Targets as a bitset in the same layout as GameState.crates_mask
+        self._targets_mask = 0
+        # Cells no crate can be pushed out of, see GameState.dead_mask
+        self._dead_mask = 0
+        # The level's shared flat Tile grid, indexed by y * width + x
+        self._grid = b''
+        self._W = 0
+        self._H = 0
+        # Heuristic per crate configuration (GameState.crate_hash) - h ignores the player,
+        # so every player position around the same crates shares one entry
+        self._h_cache = {}
+
     def search(self, initial_state: GameState, max_time: float, difficulty: str = "medium") -> Optional[List[Direction]]:
         start_time = time.time()
         # Much more generous node limits
@@ -16,110 +86,381 @@ class AStarSearch:
         else:  # hard
             max_nodes = 100000  # Very generous for hard puzzles
 
-        pq = PriorityQueue()
+        self._prepare(initial_state)
+        parallel = difficulty == "hard" and self.workers > 1
+
+        # The heap holds (f, index into nodes); the index doubles as the FIFO tie-breaker
         initial_h = self._heuristic(initial_state)
-        counter = 0
-        pq.put((initial_h, counter, initial_state, 0, []))
-        visited = set()
-        visited.add(initial_state._get_state_hash())
+        nodes = [_Node(initial_state, None, None, 0, initial_h)]
+        pq = [(initial_h, 0)]
+        # Closed set of Zobrist hashes - heuristic values are memoised separately in _h_cache.
+        # CPython sets cannot be pre-sized, so the table simply grows as nodes are generated
+        visited = {initial_state.zobrist}
         nodes_explored = 0
-        best_state = None
         best_heuristic = float('inf')
-        best_path = []
-
-        while not pq.empty():
-            # More generous timeout
-            if time.time() - start_time > max_time:
+        best_node = None
+
+        # Bind hot callables to locals - the loop below runs once per expansion
+        heappush, heappop = heapq.heappush, heapq.heappop
+        nodes_append = nodes.append
+        visited_add = visited.add
+        heuristic = self._heuristic
+        infinity = float('inf')
+
+        while pq:
+            # More generous timeout (the clock is only read every few nodes)
+            if nodes_explored % TIME_CHECK_INTERVAL == 0 and time.time() - start_time > max_time:
                 # Return best partial solution found
-                if best_path:
+                if best_node:
+                    best_path = _reconstruct(best_node)
                     print(f"⏱️ A* timeout - using best path found ({len(best_path)} moves)")
                     return best_path
                 print(f"⏱️ A* timeout after {nodes_explored} nodes")
                 return None
 
-            f_score, _, current_state, g_score, path = pq.get()
+            if parallel and nodes_explored >= PARALLEL_SWITCH_NODES:
+                return self._search_parallel(nodes, pq, visited, nodes_explored, best_node,
+                                             best_heuristic, initial_state, max_time, max_nodes, start_time)
+
+            f_score, index = heappop(pq)
+            current_node = nodes[index]
+            current_state = current_node.state
+            g_score = current_node.g
             nodes_explored += 1
 
             # Track best state for fallback
-            current_h = self._heuristic(current_state)
-            if current_h < best_heuristic and len(path) > 0:
+            current_h = current_node.h
+            if current_h < best_heuristic and current_node.parent is not None:
                 best_heuristic = current_h
-                best_state = current_state
-                best_path = path
+                best_node = current_node
 
             if current_state.is_solved():
+                path = _reconstruct(current_node)
                 print(f"✅ A* solved: {len(path)} moves, {nodes_explored} nodes")
                 return path
 
             # Explore all directions
-            for direction in Direction:
+            new_g = g_score + 1
+            for d in range(4):
+                if not current_state.can_move_idx(d):
+                    continue
                 new_state = current_state.clone()
-                if new_state.move(direction):
-                    state_hash = new_state._get_state_hash()
-                    if state_hash not in visited:
-                        visited.add(state_hash)
-                        new_g = g_score + 1
-                        new_h = self._heuristic(new_state)
-                        new_f = new_g + new_h
-                        new_path = path + [direction]
-                        counter += 1
-                        pq.put((new_f, counter, new_state, new_g, new_path))
+                new_state.move_idx(d)
+                state_hash = new_state.zobrist
+                if state_hash not in visited:
+                    visited_add(state_hash)
+                    if new_state.pushes != current_state.pushes and self._is_dead_push(new_state, d):
+                        continue  # The pushed crate is frozen or stuck on a wall line
+                    new_h = heuristic(new_state)
+                    if new_h == infinity:
+                        continue  # A crate can never reach any target
+                    heappush(pq, (new_g + new_h, len(nodes)))
+                    nodes_append(_Node(new_state, current_node, d, new_g, new_h))
 
             if nodes_explored >= max_nodes:
                 # Return best partial solution
-                if best_path:
+                if best_node:
+                    best_path = _reconstruct(best_node)
                     print(f"🔄 A* node limit - using best path ({len(best_path)} moves)")
                     return best_path
                 print(f"🛑 A* node limit: {nodes_explored} nodes")
                 break
 
         # Fallback: return best path found
-        if best_path:
+        if best_node:
+            best_path = _reconstruct(best_node)
             print(f"💡 Returning best path found: {len(best_path)} moves")
             return best_path
         return None
 
+    def _search_parallel(self, nodes: list, pq: list, visited: set, nodes_explored: int,
+                         best_node, best_heuristic: float, initial_state: GameState,
+                         max_time: float, max_nodes: int, start_time: float) -> Optional[List[Direction]]:
+        """K-parallel best-first search, continuing a sequential A* that ran long: this process
+        keeps the open and closed lists and each round hands the K lowest-f nodes to a process
+        pool for expansion. Nodes carry compact (player_pos, crates_mask, zobrist) states so
+        only a few ints cross the process boundary."""
+        batch_size = self.workers * PARALLEL_BATCH_PER_WORKER
+        # Open nodes still hold the full GameStates of the sequential phase
+        for _, index in pq:
+            state = nodes[index].state
+            nodes[index].state = (state.player_pos, state.crates_mask, state.zobrist)
+        print(f"⚙️ A* expanding on {self.workers} processes after {nodes_explored} nodes")
+
+        with multiprocessing.Pool(self.workers, initializer=_init_expand_worker, initargs=(initial_state,)) as pool:
+            while pq:
+                if time.time() - start_time > max_time:
+                    if best_node:
+                        best_path = _reconstruct(best_node)
+                        print(f"⏱️ A* timeout - using best path found ({len(best_path)} moves)")
+                        return best_path
+                    print(f"⏱️ A* timeout after {nodes_explored} nodes")
+                    return None
+
+                batch = []
+                while pq and len(batch) < batch_size:
+                    f_score, index = heapq.heappop(pq)
+                    current_node = nodes[index]
+                    nodes_explored += 1
+
+                    # Track best state for fallback
+                    current_h = current_node.h
+                    if current_h < best_heuristic and current_node.parent is not None:
+                        best_heuristic = current_h
+                        best_node = current_node
+
+                    if current_node.state[1] == self._targets_mask:
+                        path = _reconstruct(current_node)
+                        print(f"✅ A* solved: {len(path)} moves, {nodes_explored} nodes")
+                        return path
+                    batch.append(current_node)
+
+                results = pool.map(_expand_compact, [node.state for node in batch])
+                for current_node, successors in zip(batch, results):
+                    new_g = current_node.g + 1
+                    for d, compact, new_h in successors:
+                        if compact[2] in visited:
+                            continue
+                        visited.add(compact[2])
+                        if new_h == float('inf'):
+                            continue  # A crate can never reach any target
+                        heapq.heappush(pq, (new_g + new_h, len(nodes)))
+                        nodes.append(_Node(compact, current_node, d, new_g, new_h))
+
+                if nodes_explored >= max_nodes:
+                    if best_node:
+                        best_path = _reconstruct(best_node)
+                        print(f"🔄 A* node limit - using best path ({len(best_path)} moves)")
+                        return best_path
+                    print(f"🛑 A* node limit: {nodes_explored} nodes")
+                    break
+
+        if best_node:
+            best_path = _reconstruct(best_node)
+            print(f"💡 Returning best path found: {len(best_path)} moves")
+            return best_path
+        return None
+
+    def _prepare(self, initial_state: GameState):
+        """Reset per-puzzle caches and precompute the heuristic tables"""
+        self._targets = frozenset(initial_state.targets)
+        self._target_list = list(self._targets)
+        self._targets_mask = initial_state.targets_mask
+        self._dead_mask = initial_state.dead_mask
+        self._W, self._H = initial_state.width, initial_state.height
+        self._grid = initial_state.grid
+        self._h_cache = {}
+        self._precompute_target_distances(initial_state)
+
     def _heuristic(self, state: GameState) -> float:
         """Improved heuristic that's never too optimistic"""
+        h = self._h_cache.get(state.crate_hash)
+        if h is None:
+            h = self._h_cache[state.crate_hash] = self._crate_heuristic(state)
+        return h
+
+    def _crate_heuristic(self, state: GameState) -> float:
+        """Heuristic computed from the crate layout - see _heuristic for the cached entry point"""
         if state.is_solved():
             return 0
 
         total = 0
-        crates = list(state.crate_positions)
-        targets = list(state.targets)
-        unsolved = [c for c in crates if c not in state.targets]
-        if not unsolved:
+        unsolved_mask = state.crates_mask & ~self._targets_mask
+        if not unsolved_mask:
             return 0
 
-        # Simple Manhattan distance sum
-        for crate in unsolved:
-            min_dist = min(
-                abs(crate[0] - t[0]) + abs(crate[1] - t[1])
-                for t in targets
-            )
+        # Sum of true (wall-aware) distances to the nearest target
+        nearest = self._nearest_flat
+        m = unsolved_mask
+        while m:
+            bit = m & -m
+            idx = bit.bit_length() - 1
+            m ^= bit
+            min_dist = nearest[idx]
+            if min_dist == float('inf'):
+                return min_dist
             total += min_dist
 
-        # Heavy penalty for obvious deadlocks
-        for crate in unsolved:
-            if self._is_corner_deadlock(state, crate):
-                total += 500
+        # Heavy penalty for crates on dead squares (corners and dead wall lines)
+        dead = unsolved_mask & self._dead_mask
+        if dead:
+            total += 500 * bin(dead).count('1')
 
         return total
 
-    def _is_corner_deadlock(self, state: GameState, pos: Tuple[int, int]) -> bool:
-        """Simple corner deadlock check"""
-        x, y = pos
-        # Check if blocked horizontally and vertically
-        left_wall = (x == 0 or state.grid[y][x-1].value == 1)
-        right_wall = (x == state.width-1 or state.grid[y][x+1].value == 1)
-        top_wall = (y == 0 or state.grid[y-1][x].value == 1)
-        bottom_wall = (y == state.height-1 or state.grid[y+1][x].value == 1)
-
-        # If in corner (walls on two adjacent sides), it's a deadlock
-        if (left_wall or right_wall) and (top_wall or bottom_wall):
+    def _precompute_target_distances(self, state: GameState):
+        """BFS out from each target over non-wall cells, once per puzzle"""
+        # Walls and the grid edge are both -1 in the neighbor table, so no bounds checks here
+        neighbors = state.neighbors
+        self._dist = {}
+        for target in self._target_list:
+            start = target[1] * state.width + target[0]
+            dist = [float('inf')] * len(state.grid)
+            dist[start] = 0
+            queue = deque([start])
+            while queue:
+                idx = queue.popleft()
+                for d in range(4):
+                    nxt = neighbors[idx * 4 + d]
+                    if nxt >= 0 and dist[nxt] == float('inf'):
+                        dist[nxt] = dist[idx] + 1
+                        queue.append(nxt)
+            self._dist[target] = dist
+
+        # Fold the per-target maps into one table so the heuristic does a single lookup per crate
+        self._nearest_flat = [min(dists) for dists in zip(*self._dist.values())]
+
+    def _is_dead_push(self, state: GameState, d: int) -> bool:
+        """Check whether the crate just pushed in direction index d ended up in a deadlock"""
+        crate = (state.player_pos[0] + DX[d], state.player_pos[1] + DY[d])
+        # Dead squares are precomputed per level, only the 2x2 freeze depends on other crates
+        if self._dead_mask >> (crate[1] * self._W + crate[0]) & 1:
             return True
+        return self._is_frozen(state, crate)
+
+    def _is_wall(self, x: int, y: int) -> bool:
+        """Wall test that treats everything outside the grid as wall"""
+        if not (0 <= x < self._W and 0 <= y < self._H):
+            return True
+        return self._grid[y * self._W + x] == Tile.WALL
+
+    def _is_frozen(self, state: GameState, crate: Tuple[int, int]) -> bool:
+        """2x2 freeze check - a block of crates/walls with a crate off target can never move"""
+        x, y = crate
+        crates, W = state.crates_mask, self._W
+        for ox in (x - 1, x):
+            for oy in (y - 1, y):
+                blocked = True
+                off_target = False
+                for cx, cy in ((ox, oy), (ox + 1, oy), (ox, oy + 1), (ox + 1, oy + 1)):
+                    if self._is_wall(cx, cy):
+                        continue
+                    bit = 1 << (cy * W + cx)
+                    if not crates & bit:
+                        blocked = False
+                        break
+                    if not self._targets_mask & bit:
+                        off_target = True
+                if blocked and off_target:
+                    return True
         return False
 
+def _mask_cells(state: GameState, mask: int) -> set:
+    """Unpack a bitboard into the set of (x, y) cells it covers"""
+    cells = set()
+    cell_pos = state.cell_pos
+    while mask:
+        bit = mask & -mask
+        cells.add(cell_pos[bit.bit_length() - 1])
+        mask ^= bit
+    return cells
+
+# Per-process state for the parallel A* pool workers
+_worker_search = None
+_worker_template = None
+
+def _init_expand_worker(initial_state: GameState):
+    """Pool initializer - build the heuristic tables once per worker process"""
+    global _worker_search, _worker_template
+    _worker_search = AStarSearch(workers=1)
+    _worker_search._prepare(initial_state)
+    _worker_template = initial_state
+
+def _expand_compact(compact: Tuple) -> List[Tuple]:
+    """Expand a compact state in a worker, returning (direction index, compact, h) per legal successor"""
+    player_pos, crates_mask, zobrist = compact
+    state = _worker_template.clone()
+    state.player_pos = player_pos
+    state.crate_positions = _mask_cells(state, crates_mask)
+    state.crates_mask = crates_mask
+    state.crates_on_target = bin(crates_mask & state.targets_mask).count('1')
+    state.crate_hash = zobrist ^ state.zobrist_player[player_pos]
+    state.zobrist = zobrist
+    successors = []
+    for d in range(4):
+        if not state.can_move_idx(d):
+            continue
+        new_state = state.clone()
+        new_state.move_idx(d)
+        if new_state.pushes != state.pushes and _worker_search._is_dead_push(new_state, d):
+            continue
+        successors.append((
+            d,
+            (new_state.player_pos, new_state.crates_mask, new_state.zobrist),
+            _worker_search._heuristic(new_state)
+        ))
+    return successors
+
+class IDAStarSearch(AStarSearch):
+    """Iterative deepening A* - memory grows with solution depth instead of nodes explored"""
+    def __init__(self):
+        super().__init__(workers=1)
+        self._nodes_explored = 0
+        self._deadline = 0.0
+        self._stopped = False
+
+    def search(self, initial_state: GameState, max_time: float, difficulty: str = "medium") -> Optional[List[Direction]]:
+        start_time = time.time()
+        # Memory stays O(depth) however many states are re-expanded, so there is no node
+        # cap - the deadline alone bounds the search
+        self._prepare(initial_state)
+        self._nodes_explored = 0
+        self._deadline = start_time + max_time
+        self._stopped = False
+
+        bound = self._heuristic(initial_state)
+        path = []
+        # Only states on the current path are remembered, they are dropped on backtrack
+        on_path = {initial_state.zobrist}
+        while bound != float('inf'):
+            found, next_bound = self._dfs(initial_state, 0, bound, path, on_path)
+            if found:
+                print(f"✅ IDA* solved: {len(path)} moves, {self._nodes_explored} nodes")
+                return path
+            if self._stopped:
+                print(f"🛑 IDA* stopped at bound {bound} after {self._nodes_explored} nodes")
+                return None
+            bound = next_bound
+
+        print(f"🛑 IDA* exhausted after {self._nodes_explored} nodes")
+        return None
+
+    def _dfs(self, state: GameState, g: int, bound: float, path: List[Direction], on_path: set) -> Tuple[bool, float]:
+        """Depth-first probe below bound - returns (found, smallest f that exceeded bound)"""
+        f = g + self._heuristic(state)
+        if f > bound:
+            return False, f
+        if state.is_solved():
+            return True, f
+
+        self._nodes_explored += 1
+        if self._nodes_explored % TIME_CHECK_INTERVAL == 0 and time.time() > self._deadline:
+            self._stopped = True
+        if self._stopped:
+            return False, float('inf')
+
+        minimum = float('inf')
+        for d in range(4):
+            if not state.can_move_idx(d):
+                continue
+            new_state = state.clone()
+            new_state.move_idx(d)
+            if new_state.zobrist in on_path:
+                continue
+            if new_state.pushes != state.pushes and self._is_dead_push(new_state, d):
+                continue
+
+            path.append(DIRS[d])
+            on_path.add(new_state.zobrist)
+            found, t = self._dfs(new_state, g + 1, bound, path, on_path)
+            if found:
+                return True, t
+            path.pop()
+            on_path.discard(new_state.zobrist)
+            if t < minimum:
+                minimum = t
+        return False, minimum
+
 class BFSSearch:
     """BFS with much more generous limits"""
     def search(self, initial_state: GameState, max_time: float, difficulty: str = "medium") -> Optional[List[Direction]]:
@@ -132,45 +473,61 @@ class BFSSearch:
         else:
             max_nodes = 80000
 
-        queue = Queue()
-        queue.put((initial_state, []))
-        visited = set()
-        visited.add(initial_state._get_state_hash())
+        if initial_state.is_solved():
+            return []
+        # BFS runs on compact (player index, crates bitboard) states expanded through the
+        # level's neighbor table - no GameState is cloned per node. The search tree itself
+        # is kept as two flat arrays (parent id, direction index) instead of node objects;
+        # only the queue, which holds a single layer or so, carries the full states.
+        expand = initial_state.expand
+        targets_mask = initial_state.targets_mask
+        root = (initial_state.player_idx, initial_state.crates_mask)
+        parents = array('i', [-1])
+        actions = bytearray(1)
+        parents_append = parents.append
+        actions_append = actions.append
+        queue = deque()
+        queue.append((0, root, 0))
+        visited = {root}
+        visited_add = visited.add
         nodes_explored = 0
-        best_path = []
+        best_id = None
+        best_g = 0
 
-        while not queue.empty():
+        while queue:
             if time.time() - start_time > max_time:
-                if best_path:
+                if best_id is not None:
+                    best_path = _reconstruct_ids(parents, actions, best_id)
                     print(f"⏱️ BFS timeout - using best path ({len(best_path)} moves)")
                     return best_path
                 print(f"⏱️ BFS timeout after {nodes_explored} nodes")
                 return None
 
-            current_state, path = queue.get()
+            node_id, state, g = queue.popleft()
             nodes_explored += 1
 
             # Keep track of any progress
-            if len(path) > len(best_path) and len(path) < 100:
-                best_path = path
-
-            if current_state.is_solved():
-                print(f"✅ BFS solved: {len(path)} moves, {nodes_explored} nodes")
-                return path
-
-            for direction in Direction:
-                new_state = current_state.clone()
-                if new_state.move(direction):
-                    state_hash = new_state._get_state_hash()
-                    if state_hash not in visited:
-                        visited.add(state_hash)
-                        new_path = path + [direction]
-                        queue.put((new_state, new_path))
+            if best_g < g < 100:
+                best_id, best_g = node_id, g
+
+            for d, player_idx, crates_mask in expand(*state):
+                key = (player_idx, crates_mask)
+                if key not in visited:
+                    visited_add(key)
+                    new_id = len(parents)
+                    parents_append(node_id)
+                    actions_append(d)
+                    # Goal test on generation saves popping a whole extra layer
+                    if crates_mask == targets_mask:
+                        path = _reconstruct_ids(parents, actions, new_id)
+                        print(f"✅ BFS solved: {len(path)} moves, {nodes_explored} nodes")
+                        return path
+                    queue.append((new_id, key, g + 1))
 
             if nodes_explored >= max_nodes:
-                if best_path:
+                if best_id is not None:
                     print(f"🔄 BFS node limit - using progress made")
-                    return best_path
+                    return _reconstruct_ids(parents, actions, best_id)
                 print(f"🛑 BFS node limit: {nodes_explored} nodes")
                 break
 
@@ -192,104 +549,127 @@ class DFSSearch:
             max_nodes = 80000
 
         stack = deque()
-        stack.append((initial_state, [], 0))
-        visited = set()
-        visited.add(initial_state._get_state_hash())
+        stack.append(SearchNode(initial_state, None, None, 0))
+        if initial_state.is_solved():
+            return []
+        visited = {initial_state.zobrist}
+        visited_add = visited.add
         nodes_explored = 0
-        best_path = []
 
         while stack:
             if time.time() - start_time > max_time:
-                if best_path:
-                    print(f"⏱️ DFS timeout - using best path ({len(best_path)} moves)")
-                    return best_path
                 print(f"⏱️ DFS timeout after {nodes_explored} nodes")
                 return None
 
-            current_state, path, depth = stack.pop()
+            # The deepest node is not a meaningful partial solution for DFS,
+            # so no best path is tracked - a failed search falls back to greedy
+            current_node = stack.pop()
+            current_state = current_node.state
             nodes_explored += 1
 
-            if len(path) > len(best_path) and len(path) < 100:
-                best_path = path
-
-            if current_state.is_solved():
-                print(f"✅ DFS solved: {len(path)} moves, {nodes_explored} nodes")
-                return path
-
-            if depth >= max_depth:
+            if current_node.g >= max_depth:
                 continue
 
-            for direction in Direction:
+            for d in range(4):
+                if not current_state.can_move_idx(d):
+                    continue
                 new_state = current_state.clone()
-                if new_state.move(direction):
-                    state_hash = new_state._get_state_hash()
-                    if state_hash not in visited:
-                        visited.add(state_hash)
-                        new_path = path + [direction]
-                        stack.append((new_state, new_path, depth + 1))
+                new_state.move_idx(d)
+                state_hash = new_state.zobrist
+                if state_hash not in visited:
+                    visited_add(state_hash)
+                    new_node = SearchNode(new_state, current_node, d, current_node.g + 1)
+                    # Goal test on generation saves popping a whole extra layer
+                    if new_state.is_solved():
+                        path = _reconstruct(new_node)
+                        print(f"✅ DFS solved: {len(path)} moves, {nodes_explored} nodes")
+                        return path
+                    stack.append(new_node)
 
             if nodes_explored >= max_nodes:
-                if best_path:
-                    print(f"🔄 DFS node limit - using progress made")
-                    return best_path
                 print(f"🛑 DFS node limit: {nodes_explored} nodes")
                 break
 
         return None
 
+def _greedy_order(vertical: bool, sx: int, sy: int) -> Tuple[Direction, ...]:
+    """Move preference for the greedy fallback given the signs of the offset to the crate"""
+    order = []
+    if vertical:  # Vertical distance larger
+        order.append(Direction.DOWN if sy > 0 else Direction.UP)
+        if sx > 0:
+            order.append(Direction.RIGHT)
+        elif sx < 0:
+            order.append(Direction.LEFT)
+    else:  # Horizontal distance larger
+        order.append(Direction.RIGHT if sx > 0 else Direction.LEFT)
+        if sy > 0:
+            order.append(Direction.DOWN)
+        elif sy < 0:
+            order.append(Direction.UP)
+    # Add remaining directions
+    order.extend(d for d in DIRS if d not in order)
+    return tuple(order)
+
+# Every possible preference order, keyed by (vertical, sign(dx), sign(dy))
+_GREEDY_ORDERS = {
+    (vertical, sx, sy): _greedy_order(vertical, sx, sy)
+    for vertical in (True, False) for sx in (-1, 0, 1) for sy in (-1, 0, 1)
+}
+
 class SimpleGreedyFallback:
     """Simple greedy strategy as last resort"""
+    def __init__(self):
+        # Last answer, reused while the state (player and crates) is unchanged
+        self._last_key = None
+        self._last_move = None
+
     def get_next_move(self, state: GameState) -> Optional[Direction]:
         """Get a single greedy move toward nearest unsolved crate"""
-        unsolved_crates = [c for c in state.crate_positions if c not in state.targets]
-        if not unsolved_crates:
+        if state.zobrist == self._last_key:
+            return self._last_move
+
+        self._last_key = state.zobrist
+        self._last_move = self._choose_move(state)
+        return self._last_move
+
+    def _choose_move(self, state: GameState) -> Optional[Direction]:
+        """Pick the first legal move toward the nearest unsolved crate"""
+        if not state.crates_mask & ~state.targets_mask:
             return None
+        unsolved_crates = [c for c in state.crate_positions if c not in state.targets]
 
         # Find nearest unsolved crate
-        player_pos = state.player_pos
-        nearest_crate = min(
-            unsolved_crates,
-            key=lambda c: abs(c[0] - player_pos[0]) + abs(c[1] - player_pos[1])
-        )
-
-        # Try to move toward it
-        dx = nearest_crate[0] - player_pos[0]
-        dy = nearest_crate[1] - player_pos[1]
-
-        # Try moves in order of preference
-        moves_to_try = []
-        if abs(dy) > abs(dx):  # Vertical distance larger
-            if dy > 0:
-                moves_to_try.append(Direction.DOWN)
-            else:
-                moves_to_try.append(Direction.UP)
-            if dx > 0:
-                moves_to_try.append(Direction.RIGHT)
-            elif dx < 0:
-                moves_to_try.append(Direction.LEFT)
-        else:  # Horizontal distance larger
-            if dx > 0:
-                moves_to_try.append(Direction.RIGHT)
-            else:
-                moves_to_try.append(Direction.LEFT)
-            if dy > 0:
-                moves_to_try.append(Direction.DOWN)
-            elif dy < 0:
-                moves_to_try.append(Direction.UP)
-
-        # Add remaining directions
-        for d in Direction:
-            if d not in moves_to_try:
-                moves_to_try.append(d)
-
-        # Try each move
-        for direction in moves_to_try:
-            test_state = state.clone()
-            if test_state.move(direction):
+        px, py = state.player_pos
+        nearest_crate = min(unsolved_crates, key=lambda c: abs(c[0] - px) + abs(c[1] - py))
+
+        # Try to move toward it, in order of preference
+        dx = nearest_crate[0] - px
+        dy = nearest_crate[1] - py
+        order = _GREEDY_ORDERS[(abs(dy) > abs(dx), (dx > 0) - (dx < 0), (dy > 0) - (dy < 0))]
+        for direction in order:
+            if state.can_move(direction):
                 return direction
 
         return None
 
+def _exit_on_sigterm(signum, frame):
+    """Turn terminate() into SystemExit so with-blocks unwind - a parallel A* pool gets shut
+    down with the search instead of being orphaned"""
+    sys.exit(0)
+
+def _run_search(search_algorithm, game_state: GameState, max_time: float, difficulty: str,
+                conn: Connection):
+    """Search process entry point - sends the path (or None) back over conn"""
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    try:
+        solution = search_algorithm.search(game_state, max_time, difficulty)
+    except Exception as e:
+        print(f"❌ Error in AI search: {e}")
+        solution = None
+    conn.send(solution)
+    conn.close()
+
 class AIController:
     """Enhanced AI controller with fallback strategies"""
     def __init__(self, algorithm: str = "astar", difficulty: str = "medium"):
@@ -303,6 +683,8 @@ class AIController:
             self.search_algorithm = BFSSearch()
         elif self.algorithm_name == "dfs":
             self.search_algorithm = DFSSearch()
+        elif self.algorithm_name == "idastar":
+            self.search_algorithm = IDAStarSearch()
         else:
             self.search_algorithm = AStarSearch()
             self.algorithm_name = "astar"
@@ -321,10 +703,14 @@ class AIController:
         self.current_step = 0
         self.is_thinking = False
         self.using_fallback = False
+        # Each search runs in its own process so the UI keeps rendering while the AI thinks,
+        # and so a search that is no longer wanted can be killed outright
+        self._process: Optional[multiprocessing.Process] = None
+        self._conn: Optional[Connection] = None
         print(f"🤖 AI ready: {self.algorithm_name.upper()}, {self.difficulty.upper()}")
 
     def compute_solution(self, game_state: GameState) -> bool:
-        """Compute solution - ALWAYS returns True (never fails)"""
+        """Start computing a solution in the background - ALWAYS returns True (never fails)"""
         if self.is_thinking:
             return True
 
@@ -333,25 +719,50 @@ class AIController:
         print(f"🤔 AI computing solution ({self.algorithm_name.upper()})...")
 
         max_time = self.search_times.get(self.difficulty, 8.0)
-        solution = self.search_algorithm.search(game_state, max_time, self.difficulty)
+        self._conn, child_conn = multiprocessing.Pipe(duplex=False)
+        # Not a daemon - daemonic processes may not start the parallel A* pool
+        self._process = multiprocessing.Process(
+            target=_run_search,
+            args=(self.search_algorithm, game_state, max_time, self.difficulty, child_conn)
+        )
+        self._process.start()
+        child_conn.close()
+        return True
 
+    def poll_solution(self) -> bool:
+        """Collect the background search result if it is done - returns True once moves are ready"""
+        if not self.is_thinking:
+            return True
+        # poll() is also True at EOF, when the search process died without sending a result
+        if not self._conn.poll():
+            return False
+
+        try:
+            solution = self._conn.recv()
+        except Exception as e:
+            print(f"❌ Error in AI search: {e}")
+            solution = None
+        self._process.join(timeout=1.0)
+        self._stop_search()
         self.is_thinking = False
 
         if solution and len(solution) > 0:
             self.solution_path = solution
             self.current_step = 0
             print(f"💡 AI found path with {len(solution)} moves")
-            return True
         else:
             # FALLBACK: Use greedy strategy
             print(f"⚠️ Search incomplete - using greedy fallback")
             self.using_fallback = True
             self.solution_path = []
             self.current_step = 0
-            return True  # Never fail!
+        return True  # Never fail!
 
     def get_next_move(self, game_state: GameState) -> Optional[Direction]:
-        """Get next move - uses fallback if needed"""
+        """Get next move - uses fallback if needed, None while still thinking"""
+        if not self.poll_solution():
+            return None
+
         if self.using_fallback:
             # Recompute greedy move each time
             return self.greedy_fallback.get_next_move(game_state)
@@ -369,9 +780,28 @@ class AIController:
             return True  # Always has greedy moves
         return len(self.solution_path) > 0 and self.current_step < len(self.solution_path)
 
+    def _stop_search(self):
+        """Kill the search process if it is still running and release its pipe"""
+        if self._process is not None:
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join(timeout=1.0)
+                if self._process.is_alive():
+                    self._process.kill()
+            self._process.join()
+            self._process = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
     def reset(self):
-        """Reset AI state"""
+        """Reset AI state, killing any search still in progress"""
+        self._stop_search()
         self.solution_path = []
         self.current_step = 0
         self.is_thinking = False
-        self.using_fallback = False
\ No newline at end of file
+        self.using_fallback = False
+
+    def close(self):
+        """Shut down the background search process"""
+        self.reset()
\ No newline at end of file
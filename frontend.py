@@ -4,8 +4,7 @@ Sokoban Frontend - Fixed with proper AI move execution
 
 import pygame
 from typing import Tuple, Optional
-from game_engine import SokobanGame, Direction, Tile, get_level
-from ai_agent import AIController
+from game_engine import SokobanGame, Direction, Tile, get_level, load_level
 
 
 # Color scheme
@@ -38,14 +37,65 @@ COLORS = {
     'silver': (192, 192, 192)
 }
 
+# Colors used on every frame, resolved once instead of hashing into COLORS
+BACKGROUND = COLORS['background']
+TEXT_COLOR = COLORS['text']
+PANEL_COLOR = COLORS['panel']
+WALL_COLOR = COLORS['wall']
+WALL_HIGHLIGHT = COLORS['wall_highlight']
+WALL_SHADOW = COLORS['wall_shadow']
+FLOOR = COLORS['floor']
+FLOOR_ALT = COLORS['floor_alt']
+TARGET_COLOR = COLORS['target']
+TARGET_GLOW = COLORS['target_glow']
+CRATE_COLOR = COLORS['crate']
+CRATE_HIGHLIGHT = COLORS['crate_highlight']
+CRATE_SHADOW = COLORS['crate_shadow']
+CRATE_ON_TARGET = COLORS['crate_on_target']
+CRATE_ON_TARGET_HIGHLIGHT = (80, 200, 80)
+CRATE_ON_TARGET_SHADOW = (30, 100, 30)
+# (fill, shadow, highlight) for a crate off / on a target
+CRATE_STYLE = (CRATE_COLOR, CRATE_SHADOW, CRATE_HIGHLIGHT)
+CRATE_ON_TARGET_STYLE = (CRATE_ON_TARGET, CRATE_ON_TARGET_SHADOW, CRATE_ON_TARGET_HIGHLIGHT)
+# (fill, outline) for each player's token
+HUMAN_STYLE = (COLORS['human'], COLORS['human_outline'])
+AI_STYLE = (COLORS['ai'], COLORS['ai_outline'])
+BUTTON_ACTIVE = COLORS['button_active']
+
 TILE_SIZE = 60
 FPS = 60
 ANIMATION_SPEED = 10
+STAT_CACHE_SIZE = 512
+INSTRUCTIONS = "Click PLAY buttons to start | Use Arrow Keys/WASD when playing | Compare speeds!"
+
+
+def step_animations(screen_x, screen_y, target_x, target_y, animating) -> int:
+    """Advance every animating row of the column lists by one frame.
+    Returns how many rows are still animating."""
+    speed = ANIMATION_SPEED
+    moving = 0
+    for i in range(len(animating)):
+        if not animating[i]:
+            continue
+        dx = target_x[i] - screen_x[i]
+        dy = target_y[i] - screen_y[i]
+        if dx:
+            screen_x[i] += dx if -speed < dx < speed else (speed if dx > 0 else -speed)
+        if dy:
+            screen_y[i] += dy if -speed < dy < speed else (speed if dy > 0 else -speed)
+        if -speed < dx < speed and -speed < dy < speed:
+            animating[i] = False
+        else:
+            moving += 1
+    return moving
 
 
 class AnimatedSprite:
     """Smooth sprite animation"""
     
+    __slots__ = ('grid_x', 'grid_y', 'tile_size', 'screen_x', 'screen_y',
+                 'target_x', 'target_y', 'is_animating')
+    
     def __init__(self, x: int, y: int, tile_size: int):
         self.grid_x = x
         self.grid_y = y
@@ -63,9 +113,10 @@ class AnimatedSprite:
         self.target_y = grid_y * self.tile_size
         self.is_animating = True
     
-    def update(self):
+    def update(self) -> bool:
+        """Advance one frame - returns False when there was nothing to animate"""
         if not self.is_animating:
-            return
+            return False
         
         dx = self.target_x - self.screen_x
         dy = self.target_y - self.screen_y
@@ -82,44 +133,131 @@ class AnimatedSprite:
             self.screen_x = self.target_x
             self.screen_y = self.target_y
             self.is_animating = False
+        return True
     
     def get_screen_pos(self) -> Tuple[int, int]:
         return (int(self.screen_x), int(self.screen_y))
 
 
+class CrateSpriteArray:
+    """Crate animations stored column-wise - one list per field, one row per crate.
+    Rows keep their identity across moves, so a pushed crate slides to its new cell."""
+    
+    __slots__ = ('tile_size', '_player_pos', '_pushes', '_targets', 'grid_xy', 'screen_x', 'screen_y',
+                 'target_x', 'target_y', 'animating', 'moving', 'on_target', 'index')
+    
+    def __init__(self, state, tile_size: int):
+        self.tile_size = tile_size
+        # Player position and push count at the last update, to find the pushed crate
+        self._player_pos = state.player_pos
+        self._pushes = state.pushes
+        self._targets = frozenset(state.targets)
+        self.grid_xy = [tuple(pos) for pos in state.crate_positions]
+        self.screen_x = [x * tile_size for x, _ in self.grid_xy]
+        self.screen_y = [y * tile_size for _, y in self.grid_xy]
+        self.target_x = list(self.screen_x)
+        self.target_y = list(self.screen_y)
+        self.animating = [False] * len(self.grid_xy)
+        self.moving = 0  # number of rows with animating set
+        # Whether each crate sits on a target - only changes when that crate is pushed
+        self.on_target = [pos in self._targets for pos in self.grid_xy]
+        self.index = {pos: i for i, pos in enumerate(self.grid_xy)}
+    
+    def move_crate(self, old_pos: Tuple[int, int], new_pos: Tuple[int, int]):
+        """Retarget the row of the crate at old_pos to new_pos"""
+        i = self.index.pop(old_pos)
+        self.index[new_pos] = i
+        self.grid_xy[i] = new_pos
+        self.target_x[i] = new_pos[0] * self.tile_size
+        self.target_y[i] = new_pos[1] * self.tile_size
+        self.on_target[i] = new_pos in self._targets
+        if not self.animating[i]:
+            self.animating[i] = True
+            self.moving += 1
+    
+    def sync(self, positions):
+        """Match rows to the current crate positions, moving only crates that changed"""
+        removed = [pos for pos in self.index if pos not in positions]
+        if not removed:
+            return
+        added = [pos for pos in positions if pos not in self.index]
+        for old_pos, new_pos in zip(sorted(removed), sorted(added)):
+            self.move_crate(old_pos, new_pos)
+    
+    def follow(self, state):
+        """Update after a move - O(1) using the move direction when one crate was pushed"""
+        player_pos = state.player_pos
+        if state.pushes != self._pushes:
+            px, py = player_pos
+            dx, dy = px - self._player_pos[0], py - self._player_pos[1]
+            crate_pos = (px + dx, py + dy)
+            if (state.pushes == self._pushes + 1 and abs(dx) + abs(dy) == 1
+                    and player_pos in self.index and crate_pos in state.crate_positions):
+                self.move_crate(player_pos, crate_pos)
+            else:
+                self.sync(state.crate_positions)
+        self._player_pos = player_pos
+        self._pushes = state.pushes
+    
+    def update(self) -> bool:
+        """Advance every animating row by one frame - returns False when none moved"""
+        if not self.moving:
+            return False
+        self.moving = step_animations(self.screen_x, self.screen_y,
+                                      self.target_x, self.target_y, self.animating)
+        return True
+    
+    def screen_positions(self):
+        """Yield (on_target, (screen_x, screen_y)) for every crate"""
+        for i, on_target in enumerate(self.on_target):
+            yield on_target, (int(self.screen_x[i]), int(self.screen_y[i]))
+
+
 class Button:
     """Interactive button"""
     
+    __slots__ = ('rect', 'text', 'font', 'is_hovered', 'is_active', 'color_key',
+                 '_color', '_hover_color', '_text_surface', '_text_rect')
+    
     def __init__(self, x: int, y: int, width: int, height: int, text: str, font: pygame.font.Font, color_key: str = 'button'):
         self.rect = pygame.Rect(x, y, width, height)
-        self.text = text
         self.font = font
         self.is_hovered = False
         self.is_active = False
         self.color_key = color_key
+        self._color = COLORS[color_key]
+        self._hover_color = COLORS.get(f'{color_key}_hover', COLORS['button_hover'])
+        self.set_text(text)
+    
+    def set_text(self, text: str):
+        """Change the label and rasterize it once - draw() only blits the cached surface"""
+        self.text = text
+        self._text_surface = self.font.render(text, True, TEXT_COLOR)
+        self._text_rect = self._text_surface.get_rect(center=self.rect.center)
     
     def draw(self, screen: pygame.Surface):
         if self.is_active:
-            color = COLORS['button_active']
+            color = BUTTON_ACTIVE
         elif self.is_hovered:
-            color = COLORS.get(f'{self.color_key}_hover', COLORS['button_hover'])
+            color = self._hover_color
         else:
-            color = COLORS[self.color_key]
+            color = self._color
         
         pygame.draw.rect(screen, color, self.rect, border_radius=8)
-        pygame.draw.rect(screen, COLORS['text'], self.rect, 2, border_radius=8)
+        pygame.draw.rect(screen, TEXT_COLOR, self.rect, 2, border_radius=8)
         
-        text_surface = self.font.render(self.text, True, COLORS['text'])
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+        screen.blit(self._text_surface, self._text_rect)
     
-    def handle_event(self, event) -> bool:
-        if event.type == pygame.MOUSEMOTION:
-            self.is_hovered = self.rect.collidepoint(event.pos)
-        elif event.type == pygame.MOUSEBUTTONDOWN:
-            if self.rect.collidepoint(event.pos):
-                return True
-        return False
+    def update_hover(self, pos) -> bool:
+        """Set the hover state from the mouse position - returns True if it changed"""
+        hovered = bool(self.rect.collidepoint(pos))
+        if hovered == self.is_hovered:
+            return False
+        self.is_hovered = hovered
+        return True
+    
+    def check_click(self, event) -> bool:
+        return event.type == pygame.MOUSEBUTTONDOWN and bool(self.rect.collidepoint(event.pos))
 
 
 class GameRenderer:
@@ -136,29 +274,29 @@ class GameRenderer:
         self.small_font = pygame.font.Font(None, 28)
         self.tiny_font = pygame.font.Font(None, 22)
         
+        # Text that never changes is rendered once; stat lines are cached by text
+        self._label_you = self.title_font.render("YOU", True, COLORS['human'])
+        self._label_ai = self.title_font.render("AI", True, COLORS['ai'])
+        self._stat_cache = {}
+        
         self._init_sprites()
     
     def _init_sprites(self):
         try:
             human_state = self.game.get_human_state()
+            self.human_background = self._build_static_background(human_state)
             self.human_player = AnimatedSprite(
                 human_state.player_pos[0], human_state.player_pos[1], self.tile_size
             )
-            self.human_crates = {}
-            for crate_pos in human_state.crate_positions:
-                self.human_crates[crate_pos] = AnimatedSprite(
-                    crate_pos[0], crate_pos[1], self.tile_size
-                )
+            self.human_crates = CrateSpriteArray(human_state, self.tile_size)
             
             ai_state = self.game.get_ai_state()
+            # Both players play the same level, so they share one background
+            self.ai_background = self.human_background
             self.ai_player = AnimatedSprite(
                 ai_state.player_pos[0], ai_state.player_pos[1], self.tile_size
             )
-            self.ai_crates = {}
-            for crate_pos in ai_state.crate_positions:
-                self.ai_crates[crate_pos] = AnimatedSprite(
-                    crate_pos[0], crate_pos[1], self.tile_size
-                )
+            self.ai_crates = CrateSpriteArray(ai_state, self.tile_size)
         except Exception as e:
             print(f"❌ Error initializing sprites: {e}")
             raise
@@ -170,50 +308,33 @@ class GameRenderer:
                 human_state.player_pos[0], human_state.player_pos[1]
             )
             
-            new_crates = {}
-            for crate_pos in human_state.crate_positions:
-                if crate_pos in self.human_crates:
-                    sprite = self.human_crates[crate_pos]
-                    sprite.set_target_position(crate_pos[0], crate_pos[1])
-                    new_crates[crate_pos] = sprite
-                else:
-                    new_crates[crate_pos] = AnimatedSprite(
-                        crate_pos[0], crate_pos[1], self.tile_size
-                    )
-            self.human_crates = new_crates
+            self.human_crates.follow(human_state)
             
             ai_state = self.game.get_ai_state()
             self.ai_player.set_target_position(
                 ai_state.player_pos[0], ai_state.player_pos[1]
             )
             
-            new_crates = {}
-            for crate_pos in ai_state.crate_positions:
-                if crate_pos in self.ai_crates:
-                    sprite = self.ai_crates[crate_pos]
-                    sprite.set_target_position(crate_pos[0], crate_pos[1])
-                    new_crates[crate_pos] = sprite
-                else:
-                    new_crates[crate_pos] = AnimatedSprite(
-                        crate_pos[0], crate_pos[1], self.tile_size
-                    )
-            self.ai_crates = new_crates
+            self.ai_crates.follow(ai_state)
         except Exception as e:
             print(f"❌ Error updating sprites: {e}")
     
-    def update_animations(self):
-        self.human_player.update()
-        for sprite in self.human_crates.values():
-            sprite.update()
-        
-        self.ai_player.update()
-        for sprite in self.ai_crates.values():
-            sprite.update()
+    def update_animations(self) -> bool:
+        """Advance all sprites - returns True if anything on screen moved"""
+        moved = self.human_player.update()
+        moved |= self.human_crates.update()
+        
+        moved |= self.ai_player.update()
+        moved |= self.ai_crates.update()
+        return moved
     
     def render(self):
-        self.screen.fill(COLORS['background'])
+        """Draw both boards"""
+        self.screen.fill(BACKGROUND)
         
+        # One snapshot of each board per frame, passed down to every draw call
         human_state = self.game.get_human_state()
+        ai_state = self.game.get_ai_state()
         board_width = human_state.width * self.tile_size
         board_height = human_state.height * self.tile_size
         
@@ -221,71 +342,85 @@ class GameRenderer:
         ai_offset_x = human_offset_x + board_width + 100
         board_offset_y = 150
         
-        self._render_player_label("YOU", human_offset_x + board_width // 2, 100, COLORS['human'])
-        self._render_player_label("AI", ai_offset_x + board_width // 2, 100, COLORS['ai'])
+        self._render_player_label(self._label_you, human_offset_x + board_width // 2, 100)
+        self._render_player_label(self._label_ai, ai_offset_x + board_width // 2, 100)
         
         self._render_board(human_state, human_offset_x, board_offset_y, 
-                          self.human_player, self.human_crates, COLORS['human'])
-        self._render_board(self.game.get_ai_state(), ai_offset_x, board_offset_y, 
-                          self.ai_player, self.ai_crates, COLORS['ai'])
+                          self.human_player, self.human_crates, HUMAN_STYLE, self.human_background)
+        self._render_board(ai_state, ai_offset_x, board_offset_y, 
+                          self.ai_player, self.ai_crates, AI_STYLE, self.ai_background)
         
         self._render_stats(human_state, human_offset_x, board_offset_y + board_height + 20)
-        self._render_stats(self.game.get_ai_state(), ai_offset_x, board_offset_y + board_height + 20)
+        self._render_stats(ai_state, ai_offset_x, board_offset_y + board_height + 20)
+
     
-    def _render_board(self, state, offset_x, offset_y, player_sprite, crate_sprites, player_color):
+    def _build_static_background(self, state) -> pygame.Surface:
+        """Draw the walls, floor and targets once - they never change during a level"""
+        ts = self.tile_size
+        board_w, board_h = state.width * ts, state.height * ts
+        surface = pygame.Surface((board_w, board_h)).convert()
+        # Checkerboard floor: paint one 2x2 block of tiles, then keep doubling it
+        # across and down - O(log W + log H) blits for the whole board
+        surface.fill(FLOOR)
+        surface.fill(FLOOR_ALT, (ts, 0, ts, ts))
+        surface.fill(FLOOR_ALT, (0, ts, ts, ts))
+        filled_w = 2 * ts
+        while filled_w < board_w:
+            surface.blit(surface, (filled_w, 0), (0, 0, filled_w, 2 * ts))
+            filled_w *= 2
+        filled_h = 2 * ts
+        while filled_h < board_h:
+            surface.blit(surface, (0, filled_h), (0, 0, board_w, filled_h))
+            filled_h *= 2
+        
+        # One set of rects, moved from cell to cell
+        rect = pygame.Rect(0, 0, ts, ts)
+        inner = pygame.Rect(0, 0, ts - 8, ts - 8)
+        highlight = pygame.Rect(0, 0, ts - 8, 8)
         for y in range(state.height):
             for x in range(state.width):
-                rect = pygame.Rect(
-                    offset_x + x * self.tile_size,
-                    offset_y + y * self.tile_size,
-                    self.tile_size, self.tile_size
-                )
-                
-                tile = state.grid[y][x]
+                rect.topleft = (x * ts, y * ts)
+                tile = state.grid[y * state.width + x]
                 
                 if tile == Tile.WALL:
-                    pygame.draw.rect(self.screen, COLORS['wall_shadow'], rect)
-                    inner = rect.inflate(-8, -8)
-                    pygame.draw.rect(self.screen, COLORS['wall'], inner)
-                    highlight = pygame.Rect(inner.x, inner.y, inner.width, 8)
-                    pygame.draw.rect(self.screen, COLORS['wall_highlight'], highlight)
-                    pygame.draw.rect(self.screen, COLORS['wall_shadow'], inner, 2)
+                    pygame.draw.rect(surface, WALL_SHADOW, rect)
+                    inner.center = rect.center
+                    pygame.draw.rect(surface, WALL_COLOR, inner)
+                    highlight.topleft = inner.topleft
+                    pygame.draw.rect(surface, WALL_HIGHLIGHT, highlight)
+                    pygame.draw.rect(surface, WALL_SHADOW, inner, 2)
                 elif tile == Tile.TARGET:
-                    floor_color = COLORS['floor'] if (x + y) % 2 == 0 else COLORS['floor_alt']
-                    pygame.draw.rect(self.screen, floor_color, rect)
-                    pygame.draw.circle(self.screen, COLORS['target_glow'], 
-                                     rect.center, self.tile_size // 3 + 3)
-                    pygame.draw.circle(self.screen, COLORS['target'], 
-                                     rect.center, self.tile_size // 3)
-                else:
-                    floor_color = COLORS['floor'] if (x + y) % 2 == 0 else COLORS['floor_alt']
-                    pygame.draw.rect(self.screen, floor_color, rect)
-                
-                pygame.draw.rect(self.screen, COLORS['background'], rect, 1)
+                    pygame.draw.circle(surface, TARGET_GLOW, rect.center, ts // 3 + 3)
+                    pygame.draw.circle(surface, TARGET_COLOR, rect.center, ts // 3)
+        
+        # Grid lines: each tile has a 1px border, so inner boundaries are 2px wide
+        # and the outer edge 1px - one fill per boundary instead of one outline per tile
+        for x in range(1, state.width):
+            surface.fill(BACKGROUND, (x * ts - 1, 0, 2, board_h))
+        for y in range(1, state.height):
+            surface.fill(BACKGROUND, (0, y * ts - 1, board_w, 2))
+        pygame.draw.rect(surface, BACKGROUND, (0, 0, board_w, board_h), 1)
+        return surface
+    
+    def _render_board(self, state, offset_x, offset_y, player_sprite, crate_sprites, player_style, background):
+        self.screen.blit(background, (offset_x, offset_y))
+        crate_style, crate_on_target_style = CRATE_STYLE, CRATE_ON_TARGET_STYLE
         
-        for crate_pos, sprite in crate_sprites.items():
-            screen_x, screen_y = sprite.get_screen_pos()
-            crate_rect = pygame.Rect(
-                offset_x + screen_x + 8, offset_y + screen_y + 8,
-                self.tile_size - 16, self.tile_size - 16
-            )
+        # Reused for every crate - only their positions change
+        crate_rect = pygame.Rect(0, 0, self.tile_size - 16, self.tile_size - 16)
+        shadow_rect = crate_rect.copy()
+        highlight_rect = pygame.Rect(0, 0, crate_rect.width - 8, 8)
+        
+        for on_target, (screen_x, screen_y) in crate_sprites.screen_positions():
+            crate_rect.topleft = (offset_x + screen_x + 8, offset_y + screen_y + 8)
             
-            if crate_pos in state.targets:
-                color = COLORS['crate_on_target']
-                shadow = (30, 100, 30)
-                highlight = (80, 200, 80)
-            else:
-                color = COLORS['crate']
-                shadow = COLORS['crate_shadow']
-                highlight = COLORS['crate_highlight']
+            color, shadow, highlight = crate_on_target_style if on_target else crate_style
             
-            shadow_rect = crate_rect.copy()
-            shadow_rect.y += 4
+            shadow_rect.topleft = (crate_rect.x, crate_rect.y + 4)
             pygame.draw.rect(self.screen, shadow, shadow_rect, border_radius=6)
             pygame.draw.rect(self.screen, color, crate_rect, border_radius=6)
             
-            highlight_rect = pygame.Rect(crate_rect.x + 4, crate_rect.y + 4, 
-                                        crate_rect.width - 8, 8)
+            highlight_rect.topleft = (crate_rect.x + 4, crate_rect.y + 4)
             pygame.draw.rect(self.screen, highlight, highlight_rect, border_radius=3)
             pygame.draw.rect(self.screen, shadow, crate_rect, 3, border_radius=6)
         
@@ -296,15 +431,14 @@ class GameRenderer:
         shadow_center = (center[0] + 2, center[1] + 3)
         pygame.draw.circle(self.screen, (0, 0, 0), shadow_center, self.tile_size // 3 + 2)
         
-        outline_color = COLORS[f'{state.player_id}_outline']
+        player_color, outline_color = player_style
         pygame.draw.circle(self.screen, outline_color, center, self.tile_size // 3 + 3)
         pygame.draw.circle(self.screen, player_color, center, self.tile_size // 3)
         
         highlight_pos = (center[0] - 4, center[1] - 4)
         pygame.draw.circle(self.screen, (255, 255, 255), highlight_pos, self.tile_size // 6)
     
-    def _render_player_label(self, text, center_x, y, color):
-        surface = self.title_font.render(text, True, color)
+    def _render_player_label(self, surface, center_x, y):
         rect = surface.get_rect(center=(center_x, y))
         self.screen.blit(surface, rect)
     
@@ -320,8 +454,15 @@ class GameRenderer:
             stats.append("✅ SOLVED!")
         
         for i, text in enumerate(stats):
-            color = COLORS['gold'] if "SOLVED" in text else COLORS['text']
-            surface = self.small_font.render(text, True, color)
+            surface = self._stat_cache.pop(text, None)
+            if surface is None:
+                if len(self._stat_cache) >= STAT_CACHE_SIZE:
+                    # Drop the least recently used entry - mostly stale "Time:" lines
+                    del self._stat_cache[next(iter(self._stat_cache))]
+                color = COLORS['gold'] if "SOLVED" in text else COLORS['text']
+                surface = self.small_font.render(text, True, color)
+            # (Re)inserting keeps the dict in least- to most-recently-used order
+            self._stat_cache[text] = surface
             self.screen.blit(surface, (x, y + i * 28))
 
 
@@ -336,14 +477,24 @@ class SokobanFrontend:
             self.algorithm = "astar"
             self.level_index = 0
             
-            level_data = get_level(self.difficulty, self.level_index)
-            board_width = max(len(row) for row in level_data) * TILE_SIZE
-            board_height = len(level_data) * TILE_SIZE
+            # Parsed (and cached) here so the game built in _init_game reuses it
+            level = load_level(get_level(self.difficulty, self.level_index))
+            board_width = level.width * TILE_SIZE
+            board_height = level.height * TILE_SIZE
             
             self.window_width = board_width * 2 + 200
             self.window_height = board_height + 400
             
-            self.screen = pygame.display.set_mode((self.window_width, self.window_height))
+            try:
+                # GPU-backed, vsynced presentation where the platform supports it
+                self.screen = pygame.display.set_mode(
+                    (self.window_width, self.window_height), pygame.SCALED | pygame.DOUBLEBUF, vsync=1
+                )
+            except pygame.error as e:
+                print(f"⚠️  Accelerated display unavailable ({e}), using a software window")
+                self.screen = pygame.display.set_mode((self.window_width, self.window_height))
+            # Hover is polled from the mouse position, so motion events are never needed
+            pygame.event.set_blocked(pygame.MOUSEMOTION)
             pygame.display.set_caption("Sokoban: AI Performance Demo")
             
             self.clock = pygame.time.Clock()
@@ -352,6 +503,14 @@ class SokobanFrontend:
             self.ui_font = pygame.font.Font(None, 24)
             self.button_font = pygame.font.Font(None, 22)
             self.big_button_font = pygame.font.Font(None, 28)
+            self.inst_font = pygame.font.Font(None, 20)
+            
+            self.diff_label = self.ui_font.render("DIFFICULTY:", True, COLORS['text'])
+            self.algo_label = self.ui_font.render("ALGORITHM:", True, COLORS['text'])
+            self.instruction_surface = self.inst_font.render(INSTRUCTIONS, True, COLORS['text'])
+            self.instruction_rect = self.instruction_surface.get_rect(
+                center=(self.window_width // 2, self.window_height - 25)
+            )
             
             self._create_ui_buttons()
             self._init_game()
@@ -359,7 +518,7 @@ class SokobanFrontend:
             self.human_playing = False
             self.ai_playing = False
             self.ai_move_delay = 0.15  # Seconds between AI moves
-            self.ai_last_move_time = 0
+            self.ai_time_since_move = self.ai_move_delay  # first AI move plays right away
             
         except Exception as e:
             print(f"❌ Error initializing frontend: {e}")
@@ -381,6 +540,7 @@ class SokobanFrontend:
         self.algo_astar = Button(algo_start_x, top_y, button_w, button_h, "A*", self.button_font)
         self.algo_bfs = Button(algo_start_x + spacing, top_y, button_w, button_h, "BFS", self.button_font)
         self.algo_dfs = Button(algo_start_x + spacing * 2, top_y, button_w, button_h, "DFS", self.button_font)
+        self.algo_idastar = Button(algo_start_x + spacing * 3, top_y, button_w, button_h, "IDA*", self.button_font)
         
         bottom_y = self.window_height - 120
         play_button_w = 200
@@ -414,9 +574,13 @@ class SokobanFrontend:
         self.algorithm_buttons = {
             'astar': self.algo_astar,
             'bfs': self.algo_bfs,
-            'dfs': self.algo_dfs
+            'dfs': self.algo_dfs,
+            'idastar': self.algo_idastar
         }
         
+        self.all_buttons = [*self.difficulty_buttons.values(), *self.algorithm_buttons.values(),
+                            self.human_play_button, self.ai_play_button, self.reset_button]
+        
         self._update_button_states()
     
     def _update_button_states(self):
@@ -432,11 +596,20 @@ class SokobanFrontend:
             self.game = SokobanGame(level_data)
             self.renderer = GameRenderer(self.screen, self.game)
             
+            if getattr(self, 'ai_controller', None) is not None:
+                self.ai_controller.close()
+            # Imported here so the window opens before the search module
+            # (and multiprocessing) is loaded
+            from ai_agent import AIController
             self.ai_controller = AIController(self.algorithm, self.difficulty)
             self.ai_solution_computed = False
+            # The finished search result, played back by index
+            self.ai_moves: Optional[Tuple[Direction, ...]] = None
+            self.ai_move_idx = 0
             
             self.human_playing = False
             self.ai_playing = False
+            self.needs_redraw = True
             
             print(f"✅ Game ready: {self.difficulty.upper()}, {self.algorithm.upper()}\n")
             
@@ -446,48 +619,49 @@ class SokobanFrontend:
     
     def handle_events(self):
         for event in pygame.event.get():
+            self.needs_redraw = True
             if event.type == pygame.QUIT:
                 self.running = False
                 return
             
             for name, btn in self.difficulty_buttons.items():
-                if btn.handle_event(event):
+                if btn.check_click(event):
                     if self.difficulty != name:
                         self.difficulty = name
                         self._update_button_states()
                         self._init_game()
             
             for name, btn in self.algorithm_buttons.items():
-                if btn.handle_event(event):
+                if btn.check_click(event):
                     if self.algorithm != name:
                         self.algorithm = name
                         self._update_button_states()
                         self._init_game()
             
-            if self.human_play_button.handle_event(event):
+            if self.human_play_button.check_click(event):
                 self.human_playing = not self.human_playing
-                self.human_play_button.text = "⏸ PAUSE (YOU)" if self.human_playing else "▶ PLAY (YOU)"
+                self.human_play_button.set_text("⏸ PAUSE (YOU)" if self.human_playing else "▶ PLAY (YOU)")
                 print(f"{'▶' if self.human_playing else '⏸'} Human: {'PLAYING' if self.human_playing else 'PAUSED'}")
             
-            if self.ai_play_button.handle_event(event):
+            if self.ai_play_button.check_click(event):
                 if not self.ai_playing:
                     self.ai_playing = True
-                    self.ai_play_button.text = "⏸ PAUSE AI"
+                    self.ai_play_button.set_text("⏸ PAUSE AI")
                     print(f"▶ AI: STARTING")
-                    # Compute solution immediately
+                    # Start the background search immediately
                     if not self.ai_solution_computed:
                         self.ai_controller.compute_solution(self.game.get_ai_state())
                         self.ai_solution_computed = True
                 else:
                     self.ai_playing = False
-                    self.ai_play_button.text = "▶ PLAY AI"
+                    self.ai_play_button.set_text("▶ PLAY AI")
                     print(f"⏸ AI: PAUSED")
             
-            if self.reset_button.handle_event(event):
+            if self.reset_button.check_click(event):
                 print("\n🔄 RESET\n")
                 self._init_game()
-                self.human_play_button.text = "▶ PLAY (YOU)"
-                self.ai_play_button.text = "▶ PLAY AI"
+                self.human_play_button.set_text("▶ PLAY (YOU)")
+                self.ai_play_button.set_text("▶ PLAY AI")
             
             if event.type == pygame.KEYDOWN and self.human_playing:
                 moved = False
@@ -502,70 +676,99 @@ class SokobanFrontend:
                 
                 if moved:
                     self.renderer.update_sprites()
+        
+        # Hover is polled once per frame instead of tested on every motion event
+        if self.running:
+            pos = pygame.mouse.get_pos()
+            for btn in self.all_buttons:
+                if btn.update_hover(pos):
+                    self.needs_redraw = True
     
-    def update(self):
+    def update(self, dt: float):
+        """Advance the game by dt seconds of frame time"""
         try:
-            self.renderer.update_animations()
+            self.ai_time_since_move += dt
+            if self.renderer.update_animations():
+                self.needs_redraw = True
+            
+            # Running clocks change the stats text, and the AI may move this frame
+            if self.ai_playing or self._clock_running():
+                self.needs_redraw = True
             
             # FIXED AI LOGIC
-            if self.ai_playing and not self.game.get_ai_state().is_solved():
+            ai_state = self.game.get_ai_state()
+            ai_solved = ai_state.is_solved()
+            if self.ai_playing and not ai_solved:
                 # Wait for animation to finish
                 if not self.renderer.ai_player.is_animating:
-                    current_time = pygame.time.get_ticks() / 1000.0
-                    
-                    if current_time - self.ai_last_move_time >= self.ai_move_delay:
-                        # Get next move with game state for fallback
-                        next_move = self.ai_controller.get_next_move(self.game.get_ai_state())
+                    if self.ai_time_since_move >= self.ai_move_delay:
+                        next_move = self._next_ai_move(ai_state)
                         
                         if next_move:
                             if self.game.move_ai(next_move):
                                 self.renderer.update_sprites()
-                                self.ai_last_move_time = current_time
+                                self.ai_time_since_move = 0.0
+                        elif self.ai_controller.is_thinking:
+                            # Search still running in the background - keep rendering
+                            pass
                         else:
                             # No more moves available
                             self.ai_playing = False
-                            self.ai_play_button.text = "▶ PLAY AI"
-                            if not self.game.get_ai_state().is_solved():
+                            self.ai_play_button.set_text("▶ PLAY AI")
+                            if not ai_solved:
                                 print("⚠️  AI has no more moves (may be stuck)")
             
-            elif self.ai_playing and self.game.get_ai_state().is_solved():
+            elif self.ai_playing and ai_solved:
                 # AI finished!
                 self.ai_playing = False
-                self.ai_play_button.text = "▶ PLAY AI"
+                self.ai_play_button.set_text("▶ PLAY AI")
                 print("🎉 AI SOLVED THE PUZZLE!")
                 
         except Exception as e:
             print(f"❌ Error in update: {e}")
     
+    def _next_ai_move(self, ai_state) -> Optional[Direction]:
+        """Next move of the AI solution - None while thinking or once it runs out"""
+        if self.ai_moves is None:
+            if not self.ai_controller.poll_solution():
+                return None
+            if self.ai_controller.using_fallback:
+                # Greedy moves depend on the current state, so ask the controller every time
+                return self.ai_controller.get_next_move(ai_state)
+            self.ai_moves = tuple(self.ai_controller.solution_path)
+            self.ai_move_idx = 0
+        
+        if self.ai_move_idx < len(self.ai_moves):
+            move = self.ai_moves[self.ai_move_idx]
+            self.ai_move_idx += 1
+            return move
+        return None
+    
+    def _clock_running(self) -> bool:
+        for state in (self.game.get_human_state(), self.game.get_ai_state()):
+            if state.start_time and not state.end_time:
+                return True
+        return False
+    
     def render(self):
+        self.needs_redraw = False
         self.renderer.render()
         
         panel_y = self.window_height - 210
         panel_rect = pygame.Rect(0, panel_y, self.window_width, 210)
-        pygame.draw.rect(self.screen, COLORS['panel'], panel_rect)
-        pygame.draw.line(self.screen, COLORS['text'], (0, panel_y), (self.window_width, panel_y), 2)
+        pygame.draw.rect(self.screen, PANEL_COLOR, panel_rect)
+        pygame.draw.line(self.screen, TEXT_COLOR, (0, panel_y), (self.window_width, panel_y), 2)
         
-        diff_label = self.ui_font.render("DIFFICULTY:", True, COLORS['text'])
-        self.screen.blit(diff_label, (50, panel_y + 15))
+        self.screen.blit(self.diff_label, (50, panel_y + 15))
+        self.screen.blit(self.algo_label, (400, panel_y + 15))
         
-        algo_label = self.ui_font.render("ALGORITHM:", True, COLORS['text'])
-        self.screen.blit(algo_label, (400, panel_y + 15))
-        
-        for btn in self.difficulty_buttons.values():
-            btn.draw(self.screen)
-        for btn in self.algorithm_buttons.values():
+        for btn in self.all_buttons:
             btn.draw(self.screen)
         
-        self.human_play_button.draw(self.screen)
-        self.ai_play_button.draw(self.screen)
-        self.reset_button.draw(self.screen)
-        
-        inst_y = self.window_height - 25
-        inst = "Click PLAY buttons to start | Use Arrow Keys/WASD when playing | Compare speeds!"
-        inst_surface = pygame.font.Font(None, 20).render(inst, True, COLORS['text'])
-        inst_rect = inst_surface.get_rect(center=(self.window_width // 2, inst_y))
-        self.screen.blit(inst_surface, inst_rect)
+        self.screen.blit(self.instruction_surface, self.instruction_rect)
         
+        # The SCALED window presents through an SDL renderer, where update(rects) is a full
+        # present anyway - idle frames are skipped through needs_redraw instead
         pygame.display.flip()
     
     def run(self):
@@ -577,11 +780,16 @@ class SokobanFrontend:
         print("⏱️  Compare your speed vs AI!")
         print("="*70 + "\n")
         
-        while self.running:
-            self.clock.tick(FPS)
-            self.handle_events()
-            self.update()
-            self.render()
-        
-        pygame.quit()
+        try:
+            while self.running:
+                dt = self.clock.tick(FPS) / 1000.0
+                self.handle_events()
+                self.update(dt)
+                # Nothing moved and no input arrived - the screen is already up to date
+                if self.needs_redraw:
+                    self.render()
+        finally:
+            # Also on errors - a search process left running would hold up interpreter exit
+            self.ai_controller.close()
+            pygame.quit()
         print("\n👋 Thanks for playing!\n")
\ No newline at end of file
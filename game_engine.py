@@ -1,10 +1,10 @@
-from enum import Enum
+from enum import Enum, IntEnum
 from typing import List, Tuple, Set, Optional
-import copy
+import random
 import time
 
-class Tile(Enum):
-    """Represents different tile types in the game"""
+class Tile(IntEnum):
+    """Represents different tile types in the game - stored as plain bytes in GameState.grid"""
     EMPTY = 0
     WALL = 1
     TARGET = 2
@@ -20,29 +20,52 @@ class Direction(Enum):
     LEFT = (-1, 0)
     RIGHT = (1, 0)
 
-class GameState:
-    """Represents a complete game state for a single player"""
-    def __init__(self, level_data: List[str], player_id: str):
-        """Initialize game state from level string representation"""
-        try:
-            self.player_id = player_id
-            self.moves = 0
-            self.pushes = 0
-            self.start_time = None
-            self.end_time = None
-            self.is_playing = False
+# Directions as plain ints 0..3 (UP, DOWN, LEFT, RIGHT) - Enum member and .value
+# access is slow, so hot loops index these instead of going through Direction
+DIRS = tuple(Direction)
+DX = (0, 0, -1, 1)
+DY = (-1, 1, 0, 0)
 
-            # Parse level data
-            self.width = max(len(row) for row in level_data)
-            self.height = len(level_data)
+# Column of each direction in GameState.neighbors - the UI's one Direction -> int conversion
+_DIR_INDEX = {direction: i for i, direction in enumerate(DIRS)}
 
-            # Initialize grid and find player/target positions
-            self.grid = [[Tile.EMPTY for _ in range(self.width)] for _ in range(self.height)]
-            self.player_pos = (0, 0)
-            self.targets = set()
-            self.crate_positions = set()
+# Seed for the per-cell Zobrist keys of every Level
+ZOBRIST_SEED = 0
+
+def _byte_lut(mapping: dict) -> bytes:
+    """256-entry bytes.translate table - mapped characters get their value, everything else 0"""
+    lut = bytearray(256)
+    for char, value in mapping.items():
+        lut[ord(char)] = value
+    return bytes(lut)
+
+# Level characters to the static tile under them (crates and the player are not part of
+# the grid, unknown characters are floor), and to marker flags for the movable pieces
+_TILE_LUT = _byte_lut({'#': Tile.WALL, '.': Tile.TARGET, '*': Tile.TARGET, '+': Tile.TARGET})
+_TARGET_LUT = _byte_lut({'.': 1, '*': 1, '+': 1})
+_CRATE_LUT = _byte_lut({'$': 1, '*': 1})
+_PLAYER_LUT = _byte_lut({'@': 1, '+': 1})
+
+def _find_all(buf: bytes, value: int):
+    """Offsets of every occurrence of a byte value, in order"""
+    i = buf.find(value)
+    while i >= 0:
+        yield i
+        i = buf.find(value, i + 1)
+
+def _cells_mask(cells, width: int) -> int:
+    """Pack (x, y) cells into a bitset with bit y * width + x"""
+    mask = 0
+    for x, y in cells:
+        mask |= 1 << (y * width + x)
+    return mask
+
+class Level:
+    """A parsed level - everything that never changes during play, shared by all states on it"""
+    def __init__(self, level_data: List[str]):
+        """Parse the level strings once and build the lookup tables"""
+        try:
             self._parse_level(level_data)
-            self.initial_state = self._get_state_hash()
 
             # Validate level
             if len(self.targets) == 0:
@@ -51,43 +74,165 @@ class GameState:
                 raise ValueError("Level has no crates!")
             if len(self.crate_positions) != len(self.targets):
                 raise ValueError(f"Crate/target mismatch: {len(self.crate_positions)} crates, {len(self.targets)} targets")
+
+            self._init_neighbors()
+            self._init_playable()
+            # Bitboards: bit y * width + x is set for a target / crate at (x, y)
+            self.targets_mask = _cells_mask(self.targets, self.width)
+            self.crates_mask = _cells_mask(self.crate_positions, self.width)
+            self._init_dead_squares()
+            # Zobrist keys for a player / crate on every cell, from a fixed seed so hashes
+            # are reproducible across runs and processes
+            rng = random.Random(ZOBRIST_SEED)
+            self.zobrist_player = {pos: rng.getrandbits(64) for pos in self.cell_pos}
+            self.zobrist_crate = {pos: rng.getrandbits(64) for pos in self.cell_pos}
         except Exception as e:
-            print(f"❌ Error initializing game state: {e}")
+            print(f"❌ Error parsing level: {e}")
             raise
 
     def _parse_level(self, level_data: List[str]):
-        """Parse level string into grid representation"""
-        tile_map = {
-            '#': Tile.WALL,
-            ' ': Tile.EMPTY,
-            '.': Tile.TARGET,
-            '$': Tile.CRATE,
-            '*': Tile.CRATE_ON_TARGET,
-            '@': Tile.PLAYER,
-            '+': Tile.PLAYER_ON_TARGET
-        }
-        for y, row in enumerate(level_data):
-            for x, char in enumerate(row):
-                tile = tile_map.get(char, Tile.EMPTY)
-                if tile == Tile.PLAYER:
-                    self.player_pos = (x, y)
-                    self.grid[y][x] = Tile.EMPTY
-                elif tile == Tile.PLAYER_ON_TARGET:
-                    self.player_pos = (x, y)
-                    self.grid[y][x] = Tile.TARGET
-                    self.targets.add((x, y))
-                elif tile == Tile.TARGET:
-                    self.grid[y][x] = Tile.TARGET
-                    self.targets.add((x, y))
-                elif tile == Tile.CRATE:
-                    self.grid[y][x] = Tile.EMPTY
-                    self.crate_positions.add((x, y))
-                elif tile == Tile.CRATE_ON_TARGET:
-                    self.grid[y][x] = Tile.TARGET
-                    self.targets.add((x, y))
-                    self.crate_positions.add((x, y))
+        """Parse level string into grid representation, setting width and height"""
+        # Measured once here - states and the UI read the dimensions off the cached Level
+        width = self.width = max(map(len, level_data))
+        self.height = len(level_data)
+        # The whole level as one padded row-major buffer, so byte offsets are grid indexes
+        # and each marker layer is a single C-level translate instead of a per-character branch
+        raw = ''.join(row.ljust(width) for row in level_data).encode('latin-1', 'replace')
+        # Flat row-major grid of Tile values, cell (x, y) at index y * width + x
+        self.grid = raw.translate(_TILE_LUT)
+        self.targets = frozenset(
+            (idx % width, idx // width) for idx in _find_all(raw.translate(_TARGET_LUT), 1)
+        )
+        # Row-major parse order, so every state's crate set is built in the same order
+        self.crate_positions = tuple(
+            (idx % width, idx // width) for idx in _find_all(raw.translate(_CRATE_LUT), 1)
+        )
+        idx = raw.translate(_PLAYER_LUT).rfind(1)
+        self.player_pos = (idx % width, idx // width) if idx >= 0 else (0, 0)
+
+    def _init_neighbors(self):
+        """Precompute the cell reached from every cell in every direction.
+        neighbors[idx * 4 + d] is the index of the next cell, or -1 for a wall or the grid edge."""
+        width, height = self.width, self.height
+        self.cell_pos = tuple((idx % width, idx // width) for idx in range(width * height))
+        neighbors = []
+        for x, y in self.cell_pos:
+            for dx, dy in zip(DX, DY):
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < width and 0 <= ny < height and self.grid[ny * width + nx] != Tile.WALL:
+                    neighbors.append(ny * width + nx)
                 else:
-                    self.grid[y][x] = tile
+                    neighbors.append(-1)
+        self.neighbors = tuple(neighbors)
+
+    def _init_playable(self):
+        """Flood fill from the player over non-wall cells (crates ignored) into playable_mask.
+        Moves never need a bounds check whether or not the level is wall-framed, since the
+        neighbor table already holds -1 for steps off the grid."""
+        neighbors = self.neighbors
+        start = self.player_pos[1] * self.width + self.player_pos[0]
+        playable = 1 << start
+        stack = [start]
+        while stack:
+            base = stack.pop() * 4
+            for d in range(4):
+                cell = neighbors[base + d]
+                if cell >= 0 and not playable >> cell & 1:
+                    playable |= 1 << cell
+                    stack.append(cell)
+        self.playable_mask = playable
+
+    def _init_dead_squares(self):
+        """Mark the floor cells a crate can never be pushed out of towards a target, as dead_mask.
+        Moving a crate there is a legal move, so solvers use this to prune rather than move()."""
+        neighbors = self.neighbors
+        dead = 0
+        for idx in range(len(self.grid)):
+            # Cells the player can never reach never hold a movable crate
+            if not self.playable_mask >> idx & 1 or self.targets_mask >> idx & 1:
+                continue
+            # Directions in Direction order: UP, DOWN, LEFT, RIGHT
+            blocked = [neighbors[idx * 4 + d] < 0 for d in range(4)]
+            if (blocked[0] or blocked[1]) and (blocked[2] or blocked[3]):
+                dead |= 1 << idx  # corner
+            elif self._on_dead_wall_line(idx, blocked):
+                dead |= 1 << idx
+        self.dead_mask = dead
+
+    def _on_dead_wall_line(self, idx: int, blocked: List[bool]) -> bool:
+        """Check if a cell lies against a wall it can never leave, with no target along it"""
+        neighbors = self.neighbors
+        for d in range(4):
+            if not blocked[d]:
+                continue
+            # A crate against this wall can only slide along it
+            for slide in ((2, 3) if d < 2 else (0, 1)):
+                cell = neighbors[idx * 4 + slide]
+                while cell >= 0:
+                    if self.targets_mask >> cell & 1 or neighbors[cell * 4 + d] >= 0:
+                        break
+                    cell = neighbors[cell * 4 + slide]
+                if cell >= 0:
+                    break  # found a way off the wall
+            else:
+                return True
+        return False
+
+# Parsed levels keyed by their rows - a Level is immutable, so one parse serves every
+# game and reset on the same level
+_PARSED_LEVELS = {}
+
+def load_level(level_data: List[str]) -> Level:
+    """Get the parsed Level for level strings, parsing only the first time they are seen"""
+    key = tuple(level_data)
+    level = _PARSED_LEVELS.get(key)
+    if level is None:
+        level = _PARSED_LEVELS[key] = Level(level_data)
+    return level
+
+class GameState:
+    """Represents a complete game state for a single player.
+
+    Everything taken from the Level (grid, targets, neighbor table, masks, Zobrist keys) is
+    immutable after init and shared with every clone - never mutate it in place. crate_positions
+    is the only mutable container a state owns."""
+    def __init__(self, level_data, player_id: str):
+        """Initialize game state from a Level, or from level strings (parsed once and cached)"""
+        try:
+            level = level_data if isinstance(level_data, Level) else load_level(level_data)
+            self.player_id = player_id
+            self.moves = 0
+            self.pushes = 0
+            self.start_time = None
+            self.end_time = None
+            self.is_playing = False
+
+            # Static level data, shared by reference with the Level and every clone
+            self.width = level.width
+            self.height = level.height
+            self.grid = level.grid
+            self.targets = level.targets
+            self.cell_pos = level.cell_pos
+            self.neighbors = level.neighbors
+            self.dead_mask = level.dead_mask
+            self.targets_mask = level.targets_mask
+            self.zobrist_player = level.zobrist_player
+            self.zobrist_crate = level.zobrist_crate
+
+            # Dynamic state
+            self.player_pos = level.player_pos
+            self.crate_positions = set(level.crate_positions)
+            self.crates_mask = level.crates_mask
+            self.crates_on_target = bin(self.crates_mask & self.targets_mask).count('1')
+            # crate_hash covers the crates alone, zobrist adds the player on top
+            self.crate_hash = 0
+            for crate in self.crate_positions:
+                self.crate_hash ^= self.zobrist_crate[crate]
+            self.zobrist = self.zobrist_player[self.player_pos] ^ self.crate_hash
+            self.initial_state = self._get_state_hash()
+        except Exception as e:
+            print(f"❌ Error initializing game state: {e}")
+            raise
 
     def start_playing(self):
         """Mark start time when player begins"""
@@ -95,55 +240,105 @@ class GameState:
             self.start_time = time.time()
             self.is_playing = True
 
-    def move(self, direction: Direction) -> bool:
+    def safe_move(self, direction: Direction) -> bool:
         """Attempt to move player in given direction"""
         try:
-            if not self.is_playing:
-                self.start_playing()
-
-            dx, dy = direction.value
-            new_x = self.player_pos[0] + dx
-            new_y = self.player_pos[1] + dy
-            new_pos = (new_x, new_y)
-
-            if not self._in_bounds(new_pos):
-                return False
-            if self.grid[new_y][new_x] == Tile.WALL:
-                return False
-            if new_pos in self.crate_positions:
-                crate_new_x = new_x + dx
-                crate_new_y = new_y + dy
-                crate_new_pos = (crate_new_x, crate_new_y)
-                if not self._in_bounds(crate_new_pos):
-                    return False
-                if self.grid[crate_new_y][crate_new_x] == Tile.WALL:
-                    return False
-                if crate_new_pos in self.crate_positions:
-                    return False
-                self.crate_positions.remove(new_pos)
-                self.crate_positions.add(crate_new_pos)
-                self.pushes += 1
-
-            self.player_pos = new_pos
-            self.moves += 1
-
-            # Check if solved
-            if self.is_solved() and not self.end_time:
-                self.end_time = time.time()
-
-            return True
+            return self._move_fast(_DIR_INDEX[direction])
         except Exception as e:
             print(f"❌ Error in move: {e}")
             return False
 
-    def _in_bounds(self, pos: Tuple[int, int]) -> bool:
-        """Check if position is within grid bounds"""
-        x, y = pos
-        return 0 <= x < self.width and 0 <= y < self.height
+    # Kept for backward compatibility of the public GameState API - the UI calls safe_move
+    # and the solvers move_idx
+    move = safe_move
+
+    def _move_fast(self, d: int) -> bool:
+        """Move in direction index d, starting the clock and stopping it once solved.
+        No exception handling - d must be 0..3"""
+        if not self.is_playing:
+            self.start_playing()
+        if not self.move_idx(d):
+            return False
+        if self.is_solved() and not self.end_time:
+            self.end_time = time.time()
+        return True
+
+    def move_idx(self, d: int) -> bool:
+        """Bare move by direction index 0..3 for solvers - no Enum, no timers and no solved
+        check, the search tests is_solved() itself"""
+        x, y = self.player_pos
+        new_idx = self.neighbors[(y * self.width + x) * 4 + d]
+        if new_idx < 0:
+            return False
+        new_pos = self.cell_pos[new_idx]
+        new_bit = 1 << new_idx
+        if self.crates_mask & new_bit:
+            crate_new_idx = self.neighbors[new_idx * 4 + d]
+            # Walls and the grid edge are already -1 in the table, so a single
+            # crate test on top of it covers every way the push can be blocked
+            if crate_new_idx < 0 or self.crates_mask >> crate_new_idx & 1:
+                return False
+            crate_new_pos = self.cell_pos[crate_new_idx]
+            self.crate_positions.remove(new_pos)
+            self.crate_positions.add(crate_new_pos)
+            crate_delta = self.zobrist_crate[new_pos] ^ self.zobrist_crate[crate_new_pos]
+            self.crate_hash ^= crate_delta
+            self.zobrist ^= crate_delta
+            self.crates_mask ^= new_bit | (1 << crate_new_idx)
+            # Only the two cells of the push can change the count
+            self.crates_on_target += (self.targets_mask >> crate_new_idx & 1) - (self.targets_mask >> new_idx & 1)
+            self.pushes += 1
+
+        self.zobrist ^= self.zobrist_player[self.player_pos] ^ self.zobrist_player[new_pos]
+        self.player_pos = new_pos
+        self.moves += 1
+        return True
+
+    @property
+    def player_idx(self) -> int:
+        """Flat grid index of the player"""
+        x, y = self.player_pos
+        return y * self.width + x
+
+    def expand(self, player_idx: int, crates_mask: int) -> List[Tuple[int, int, int]]:
+        """Legal successors of a compact (player index, crates bitboard) state, without building
+        GameStates - returns (direction index, player index, crates bitboard) per move"""
+        neighbors = self.neighbors
+        base = player_idx * 4
+        successors = []
+        for d in range(4):
+            new_idx = neighbors[base + d]
+            if new_idx < 0:
+                continue
+            new_bit = 1 << new_idx
+            if crates_mask & new_bit:
+                crate_new_idx = neighbors[new_idx * 4 + d]
+                if crate_new_idx < 0 or crates_mask >> crate_new_idx & 1:
+                    continue
+                successors.append((d, new_idx, crates_mask ^ new_bit ^ (1 << crate_new_idx)))
+            else:
+                successors.append((d, new_idx, crates_mask))
+        return successors
+
+    def can_move(self, direction: Direction) -> bool:
+        """Check if a move is legal without changing the state"""
+        return self.can_move_idx(_DIR_INDEX[direction])
+
+    def can_move_idx(self, d: int) -> bool:
+        """can_move for a direction index 0..3 - what the solvers call"""
+        x, y = self.player_pos
+        new_idx = self.neighbors[(y * self.width + x) * 4 + d]
+        if new_idx < 0:
+            return False
+        if self.crates_mask >> new_idx & 1:
+            crate_new_idx = self.neighbors[new_idx * 4 + d]
+            if crate_new_idx < 0 or self.crates_mask >> crate_new_idx & 1:
+                return False
+        return True
 
     def is_solved(self) -> bool:
         """Check if all crates are on targets"""
-        return self.crate_positions == self.targets
+        return self.crates_on_target == len(self.targets)
 
     def get_score(self) -> int:
         """Calculate score (lower is better)"""
@@ -157,27 +352,40 @@ class GameState:
             return self.end_time - self.start_time
         return time.time() - self.start_time
 
-    def _get_state_hash(self) -> Tuple:
-        """Get hashable representation of current state"""
-        return (self.player_pos, frozenset(self.crate_positions))
+    def _get_state_hash(self) -> Tuple[int, int]:
+        """Get hashable representation of current state - (player index, crates bitboard)"""
+        return (self.player_idx, self.crates_mask)
 
     def clone(self) -> 'GameState':
-        """Create a deep copy of this game state"""
+        """Create an independent copy of this game state - only the crate set needs copying,
+        every other field is either an immutable value or shared static level data"""
         try:
             new_state = GameState.__new__(GameState)
+            # Static level data - immutable, shared by reference
+            new_state.width = self.width
+            new_state.height = self.height
+            new_state.grid = self.grid
+            new_state.targets = self.targets
+            new_state.cell_pos = self.cell_pos
+            new_state.neighbors = self.neighbors
+            new_state.dead_mask = self.dead_mask
+            new_state.targets_mask = self.targets_mask
+            new_state.zobrist_player = self.zobrist_player
+            new_state.zobrist_crate = self.zobrist_crate
+            new_state.initial_state = self.initial_state
+            # Dynamic state - ints, tuples and None are copied by assignment
             new_state.player_id = self.player_id
             new_state.moves = self.moves
             new_state.pushes = self.pushes
             new_state.start_time = self.start_time
             new_state.end_time = self.end_time
             new_state.is_playing = self.is_playing
-            new_state.width = self.width
-            new_state.height = self.height
-            new_state.grid = copy.deepcopy(self.grid)
             new_state.player_pos = self.player_pos
-            new_state.targets = self.targets.copy()
             new_state.crate_positions = self.crate_positions.copy()
-            new_state.initial_state = self.initial_state
+            new_state.crates_mask = self.crates_mask
+            new_state.crates_on_target = self.crates_on_target
+            new_state.crate_hash = self.crate_hash
+            new_state.zobrist = self.zobrist
             return new_state
         except Exception as e:
             print(f"❌ Error cloning state: {e}")
@@ -188,19 +396,21 @@ class SokobanGame:
     def __init__(self, level_data: List[str]):
         """Initialize game with level data"""
         try:
-            self.human_state = GameState(level_data, 'human')
-            self.ai_state = GameState(level_data, 'ai')
+            # Parsed once per level - both players share the same static level data
+            level = load_level(level_data)
+            self.human_state = GameState(level, 'human')
+            self.ai_state = GameState(level, 'ai')
         except Exception as e:
             print(f"❌ Error initializing game: {e}")
             raise
 
     def move_human(self, direction: Direction) -> bool:
         """Move human player"""
-        return self.human_state.move(direction)
+        return self.human_state.safe_move(direction)
 
     def move_ai(self, direction: Direction) -> bool:
         """Move AI player"""
-        return self.ai_state.move(direction)
+        return self.ai_state.safe_move(direction)
 
     def get_human_state(self) -> GameState:
         """Get current human player state"""
@@ -213,8 +423,10 @@ class SokobanGame:
     def reset(self, level_data: List[str]):
         """Reset game with new or same level"""
         try:
-            self.human_state = GameState(level_data, 'human')
-            self.ai_state = GameState(level_data, 'ai')
+            # Parsed once per level - both players share the same static level data
+            level = load_level(level_data)
+            self.human_state = GameState(level, 'human')
+            self.ai_state = GameState(level, 'ai')
         except Exception as e:
             print(f"❌ Error resetting game: {e}")
             raise
@@ -8,7 +8,7 @@ Features:
 - Independent play buttons for YOU and AI
 - Real-time performance metrics (time, moves, score)
 - Three difficulty levels
-- Three AI algorithms (A*, BFS, DFS)
+- Four AI algorithms (A*, IDA*, BFS, DFS)
 - Visual side-by-side comparison
 
 How to Use:
@@ -39,7 +39,7 @@ def main():
     print("  • Watch AI algorithms solve puzzles in real-time")
     print("  • Compare your speed vs AI speed")
     print("  • See performance metrics: Time, Moves, Score")
-    print("  • Test different algorithms: A*, BFS, DFS")
+    print("  • Test different algorithms: A*, IDA*, BFS, DFS")
     print()
     print("🎮 HOW TO USE:")
     print("  1. Click difficulty & algorithm buttons to configure")